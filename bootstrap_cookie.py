@@ -1,9 +1,9 @@
-import pickle
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+from fantrax_extensions.cookies import save_cookies
 
 def main():
     service = Service(ChromeDriverManager().install())
@@ -19,8 +19,7 @@ def main():
         driver.get("https://www.fantrax.com/login")
         print("A Chrome window opened. Log in to Fantrax. I'll capture cookies in ~30s…")
         time.sleep(30)
-        with open("fantraxloggedin.cookie", "wb") as f:
-            pickle.dump(driver.get_cookies(), f)
+        save_cookies(driver.get_cookies(), "fantraxloggedin.cookie")
         print("Saved login cookies to fantraxloggedin.cookie")
 
 if __name__ == "__main__":
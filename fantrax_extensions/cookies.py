@@ -0,0 +1,54 @@
+"""
+Helpers for storing Fantrax login cookies captured with Selenium.
+Cookies are kept as JSON Lines, one cookie object per line, so they can be
+loaded into a session one at a time. Files written by older versions (a
+pickle, or a single JSON array) are converted the first time they are read.
+"""
+
+import json
+import pickle
+import logging
+from typing import Iterator, List
+
+# First byte of any pickle written with protocol 2 or higher
+PICKLE_MAGIC = b"\x80"
+
+# The only cookie attributes needed to rebuild the session's cookie jar
+COOKIE_FIELDS = ("name", "value", "domain", "path")
+
+def save_cookies(cookies: List[dict], path: str) -> None:
+    """Write cookies (as returned by ``driver.get_cookies()``) as JSON Lines"""
+    with open(path, "w") as f:
+        for cookie in cookies:
+            f.write(json.dumps({k: cookie[k] for k in COOKIE_FIELDS if k in cookie}))
+            f.write("\n")
+
+def _migrate_legacy(path: str) -> None:
+    """Rewrite a pickle or JSON array cookie file as JSON Lines"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    cookies = pickle.loads(raw) if raw[:1] == PICKLE_MAGIC else json.loads(raw)
+    save_cookies(cookies, path)
+    logging.info("Migrated cookies in %s to JSON Lines", path)
+
+def iter_cookies(path: str) -> Iterator[dict]:
+    """Yield cookies one at a time from a JSON Lines file"""
+    with open(path, "rb") as f:
+        head = f.read(1)
+    if head in (PICKLE_MAGIC, b"["):
+        _migrate_legacy(path)
+
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def load_session_cookies(session, path: str) -> None:
+    """Load cookies from a file into a requests session, keeping their scope"""
+    for cookie in iter_cookies(path):
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/")
+        )
@@ -6,16 +6,20 @@ Checks Fantrax starting players page and adjusts lineups accordingly.
 
 import os
 import time
+import heapq
 import json
-import pickle
 import logging
+import functools
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from configparser import ConfigParser
 from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass
+import orjson
 from requests import Session
 from fantraxapi import FantraxAPI
+from fantrax_extensions.session import create_session
 
 # Configure logging
 logging.basicConfig(
@@ -27,7 +31,59 @@ logging.basicConfig(
     ]
 )
 
-@dataclass
+# How long a status frozen at kickoff is kept before it is re-fetched
+FROZEN_STATUS_TTL = timedelta(hours=24)
+
+# Main loop cadence (seconds): poll often close to kickoff, rarely otherwise
+DEFAULT_CHECK_INTERVAL = 300  # used until player statuses are known
+NEAR_KICKOFF_CHECK_INTERVAL = 60
+MIN_CHECK_INTERVAL = 30
+MAX_CHECK_INTERVAL = 1800
+# Lineups are announced and swaps decided within this window before kickoff
+KICKOFF_WINDOW = timedelta(hours=2)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.71 Safari/537.36"
+)
+
+# Change in (gk, def, mid, fwd) counts contributed by one player at each position
+POS_DELTA = {
+    "G": (1, 0, 0, 0),
+    "D": (0, 1, 0, 0),
+    "M": (0, 0, 1, 0),
+    "F": (0, 0, 0, 1),
+}
+NO_DELTA = (0, 0, 0, 0)
+
+def is_legal_formation(gk: int, def_: int, mid: int, fwd: int) -> bool:
+    """Check if formation counts meet requirements:
+    - Exactly 11 players total
+    - 1 GK
+    - Between 3-5 DEF
+    - Between 2-5 MID
+    - Between 1-3 FWD
+    """
+    return (
+        gk + def_ + mid + fwd == 11 and  # Must have exactly 11 players
+        gk == 1 and
+        3 <= def_ <= 5 and
+        2 <= mid <= 5 and
+        1 <= fwd <= 3
+    )
+
+@functools.lru_cache(maxsize=512)
+def parse_game_time(date_iso: str, time_str: str) -> datetime:
+    """Parse a kickoff time such as "4:00PM" on the given ISO date as UTC
+
+    Only a handful of distinct kickoff times exist per matchweek, so results
+    are memoized; keying on the date means entries from previous days simply
+    stop being hit.
+    """
+    game_time = datetime.strptime(f"{date_iso} {time_str}", "%Y-%m-%d %I:%M%p")
+    return game_time.replace(tzinfo=timezone.utc)
+
+@dataclass(frozen=True, slots=True)
 class Formation:
     gk: int
     def_: int
@@ -35,26 +91,13 @@ class Formation:
     fwd: int
 
     def is_legal(self) -> bool:
-        """Check if formation meets requirements:
-        - Exactly 11 players total
-        - 1 GK
-        - Between 3-5 DEF
-        - Between 2-5 MID
-        - Between 1-3 FWD
-        """
-        total_players = self.gk + self.def_ + self.mid + self.fwd
-        return (
-            total_players == 11 and  # Must have exactly 11 players
-            self.gk == 1 and
-            3 <= self.def_ <= 5 and
-            2 <= self.mid <= 5 and
-            1 <= self.fwd <= 3
-        )
+        """Check if formation meets requirements (see is_legal_formation)"""
+        return is_legal_formation(self.gk, self.def_, self.mid, self.fwd)
 
     def __str__(self) -> str:
         return f"{self.gk}-{self.def_}-{self.mid}-{self.fwd}"
 
-@dataclass
+@dataclass(slots=True)
 class PlayerStatus:
     """Represents a player's current status for lineup decisions"""
     is_starting: Optional[bool]  # None means we don't know yet (game too far away)
@@ -81,41 +124,73 @@ class PlayerStatus:
         return time_until_game.total_seconds() <= 7200  # 2 hours in seconds
 
 class LineupOptimizer:
-    def __init__(self, league_id: str, team_id: str, cookie_path: str):
+    def __init__(self, league_id: str, team_id: str, cookie_path: str, parallel_swaps: bool = False):
         self.league_id = league_id
         self.team_id = team_id
         self.cookie_path = cookie_path
+        # Submit independent swaps concurrently (only if the league allows it)
+        self.parallel_swaps = parallel_swaps
+        # The API session also carries lineup swaps, so it must never resend
+        # a POST; only the read-only player page requests retry POSTs
         self.session = self._init_session()
+        self.read_session = self._init_session(retry_post=True)
         self.api = FantraxAPI(league_id, session=self.session)
         self.player_statuses: Dict[str, PlayerStatus] = {}  # player_id -> PlayerStatus
+        # Statuses of players whose game has kicked off no longer change
+        self._frozen_statuses: Dict[str, PlayerStatus] = {}  # player_id -> PlayerStatus
         self.last_check_time = None
 
-    def _init_session(self) -> Session:
-        """Initialize session with cookies"""
-        session = Session()
+    def _init_session(self, retry_post: bool = False) -> Session:
+        """Initialize session with cookies and a pooled keep-alive adapter
+
+        Reuses one TCP/TLS connection across pages and polling cycles, and
+        retries transient failures with backoff instead of losing the cycle.
+        Every fxpa/req call is a POST, so ``retry_post`` is needed for reads
+        to be retried at all; it must stay off for sessions that make swaps.
+        """
         try:
-            with open(self.cookie_path, "rb") as f:
-                for cookie in pickle.load(f):
-                    session.cookies.set(cookie["name"], cookie["value"])
+            session = create_session(self.cookie_path, retry_post=retry_post)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Connection": "keep-alive",
+                "Accept-Encoding": "gzip, deflate"
+            })
             logging.info("Cookie session loaded successfully")
             return session
         except Exception as e:
             logging.error(f"Failed to load cookies: {e}")
             raise
 
-    def fetch_player_page(self, page: int = 1) -> dict:
-        """Fetch a single page of player data"""
-        response = self.session.get(
+    def fetch_player_pages(self, pages: List[int]) -> dict:
+        """Fetch several pages of player data in a single batched request
+
+        The ``fxpa/req`` endpoint accepts a list of messages and answers with
+        one entry in ``responses`` per message, in the same order.
+        """
+        response = self.read_session.post(
             "https://www.fantrax.com/fxpa/req",
-            params={
-                "leagueId": self.league_id,
-                "statusOrTeamFilter": "ALL",
-                "miscDisplayType": "10",  # Starting players
-                "pageNumber": str(page),
-                "maxResultsPerPage": "100"  # Get more results per page
+            params={"leagueId": self.league_id},
+            json={
+                "msgs": [
+                    {
+                        "method": "getPlayerStats",
+                        "data": {
+                            "leagueId": self.league_id,
+                            "statusOrTeamFilter": "ALL",
+                            "miscDisplayType": "10",  # Starting players
+                            "pageNumber": str(page),
+                            "maxResultsPerPage": "100"  # Get more results per page
+                        }
+                    }
+                    for page in pages
+                ]
             }
         )
-        return response.json()
+        return orjson.loads(response.content)
+
+    def fetch_player_page(self, page: int = 1) -> dict:
+        """Fetch a single page of player data"""
+        return self.fetch_player_pages([page])
 
     def update_player_statuses(self) -> None:
         """Fetch and parse the starting players page to update player statuses"""
@@ -124,8 +199,14 @@ class LineupOptimizer:
             now = datetime.now(timezone.utc)
             self.last_check_time = now
             
-            # Clear existing statuses
+            # Reset statuses, keeping ones frozen at kickoff until they expire
+            self._frozen_statuses = {
+                player_id: status
+                for player_id, status in self._frozen_statuses.items()
+                if now - status.game_time < FROZEN_STATUS_TTL
+            }
             self.player_statuses.clear()
+            self.player_statuses.update(self._frozen_statuses)
             
             # Fetch first page
             data = self.fetch_player_page(1)
@@ -136,46 +217,43 @@ class LineupOptimizer:
             total_pages = paginated_info.get("totalNumPages", 0)
             results_per_page = paginated_info.get("maxResultsPerPage", 20)
             
-            logging.info(f"Found {total_results} total players across {total_pages} pages "
-                        f"(Results per page: {results_per_page})")
+            logging.info("Found %d total players across %d pages (Results per page: %d)",
+                         total_results, total_pages, results_per_page)
             
-            # Process all pages
-            all_players = []
-            current_page = 1
+            # Fetch pages 2..N as one batched round-trip
+            responses = data["responses"][:1] if total_pages >= 1 else []
+            if total_pages > 1:
+                data = self.fetch_player_pages(list(range(2, total_pages + 1)))
+                responses.extend(data["responses"])
             
-            while current_page <= total_pages:
-                if current_page > 1:
-                    data = self.fetch_player_page(current_page)
-                
-                if "statsTable" in data["responses"][0]["data"]:
-                    stats_table = data["responses"][0]["data"]["statsTable"]
-                    all_players.extend(stats_table)
-                    logging.info(f"Fetched page {current_page}/{total_pages} "
-                               f"({len(stats_table)} players)")
+            # Process each page's players as we go, without collecting them first
+            processed = 0
+            for current_page, page_response in enumerate(responses, start=1):
+                if "statsTable" not in page_response["data"]:
+                    continue
+                stats_table = page_response["data"]["statsTable"]
+                processed += len(stats_table)
+                logging.info("Fetched page %d/%d (%d players)",
+                             current_page, total_pages, len(stats_table))
                 
-                current_page += 1
-            
-            logging.info(f"Processing {len(all_players)} total players")
-            
-            # Process all players
-            for player in all_players:
+                for player in stats_table:
                     player_id = player["scorerId"]
+                    if player_id in self._frozen_statuses:
+                        continue
                     
                     # Parse game time if available
                     game_time = None
                     opponent = None
                     if "opponent" in player:
                         # Example: "vs MUN<br/>4:00PM" or similar
-                        opp_info = player["opponent"].split("<br/>")
-                        if len(opp_info) == 2:
-                            opponent = opp_info[0]
+                        opp_name, sep, time_str = player["opponent"].partition("<br/>")
+                        if sep:
+                            opponent = opp_name
                             try:
                                 # Convert game time string to datetime
-                                time_str = opp_info[1]
-                                game_time = datetime.strptime(f"{now.date()} {time_str}", "%Y-%m-%d %I:%M%p")
-                                game_time = game_time.replace(tzinfo=timezone.utc)
+                                game_time = parse_game_time(now.date().isoformat(), time_str)
                             except ValueError:
-                                logging.warning(f"Could not parse game time: {opp_info[1]}")
+                                logging.warning("Could not parse game time: %s", time_str)
                     
                     # Determine if player is locked
                     is_locked = False
@@ -200,28 +278,57 @@ class LineupOptimizer:
                         is_starting = False
                         is_benched = True
                     
-                    self.player_statuses[player_id] = PlayerStatus(
+                    status = PlayerStatus(
                         is_starting=is_starting,
                         is_benched=is_benched,
                         game_time=game_time,
                         is_locked=is_locked,
                         opponent=opponent
                     )
+                    self.player_statuses[player_id] = status
+                    if game_time and now >= game_time:
+                        self._frozen_statuses[player_id] = status
             
+            logging.info("Processed %d total players", processed)
             starting_count = sum(1 for status in self.player_statuses.values() if status.is_starting)
-            logging.info(f"Found {starting_count} starting players")
+            logging.info("Found %d starting players", starting_count)
             
         except Exception as e:
             logging.error(f"Error updating player statuses: {e}")
             
+    def next_check_interval(self) -> float:
+        """Seconds to wait before the next optimization cycle
+
+        Polls every minute once the next kickoff is inside the lineup window,
+        otherwise sleeps until that window opens (bounded to 30s-30min).
+        """
+        if not self.player_statuses:
+            return DEFAULT_CHECK_INTERVAL
+        
+        now = datetime.now(timezone.utc)
+        upcoming = [
+            status.game_time for status in self.player_statuses.values()
+            if status.game_time and status.game_time > now
+        ]
+        if not upcoming:
+            return MAX_CHECK_INTERVAL
+        
+        until_kickoff = min(upcoming) - now
+        if until_kickoff <= KICKOFF_WINDOW:
+            return NEAR_KICKOFF_CHECK_INTERVAL
+        wait = (until_kickoff - KICKOFF_WINDOW).total_seconds()
+        return max(MIN_CHECK_INTERVAL, min(wait, MAX_CHECK_INTERVAL))
+
     def get_player_status(self, player_id: str) -> Optional[PlayerStatus]:
         """Get status for a specific player"""
         return self.player_statuses.get(player_id)
 
-    def get_current_formation(self, roster) -> Formation:
-        """Calculate current formation from roster"""
+    def get_current_formation(self, roster, starters=None) -> Formation:
+        """Calculate current formation from roster, or from already fetched starters"""
+        if starters is None:
+            starters = roster.get_starters()
         gk = def_ = mid = fwd = 0
-        for row in roster.get_starters():
+        for row in starters:
             pos = row.pos.short_name
             if pos == "G":
                 gk += 1
@@ -244,7 +351,9 @@ class LineupOptimizer:
         return counts
 
     def can_swap_players(self, starter, bench, current_formation: Formation) -> Tuple[bool, str]:
-        """Check if two players can be swapped based on formation and game status
+        """Check if two players can be swapped based on formation
+        
+        Callers are expected to have already excluded locked players.
         
         Args:
             starter: Player to move to bench
@@ -256,46 +365,19 @@ class LineupOptimizer:
             - can_swap: True if players can be swapped
             - reason: Explanation if swap is not allowed
         """
-        # Check if starter is locked
-        starter_status = self.get_player_status(starter.player.id)
-        if starter_status and starter_status.is_locked:
-            return False, f"Cannot move {starter.player.name} to bench - player is locked (game in progress)"
-
-        # Check if bench player is locked
-        bench_status = self.get_player_status(bench.player.id)
-        if bench_status and bench_status.is_locked:
-            return False, f"Cannot move {bench.player.name} to starting lineup - player is locked (game in progress)"
-            
-        # Create new formation after swap
-        new_formation = Formation(
-            current_formation.gk,
-            current_formation.def_,
-            current_formation.mid,
-            current_formation.fwd
-        )
-        
-        # Adjust counts based on positions
-        if starter.pos.short_name == "G":
-            new_formation.gk -= 1
-        elif starter.pos.short_name == "D":
-            new_formation.def_ -= 1
-        elif starter.pos.short_name == "M":
-            new_formation.mid -= 1
-        elif starter.pos.short_name == "F":
-            new_formation.fwd -= 1
-            
-        if bench.pos.short_name == "G":
-            new_formation.gk += 1
-        elif bench.pos.short_name == "D":
-            new_formation.def_ += 1
-        elif bench.pos.short_name == "M":
-            new_formation.mid += 1
-        elif bench.pos.short_name == "F":
-            new_formation.fwd += 1
+        # Apply position deltas to get the formation counts after the swap
+        s_pos = starter.pos.short_name
+        b_pos = bench.pos.short_name
+        s = POS_DELTA.get(s_pos, NO_DELTA)
+        b = POS_DELTA.get(b_pos, NO_DELTA)
+        gk = current_formation.gk + b[0] - s[0]
+        def_ = current_formation.def_ + b[1] - s[1]
+        mid = current_formation.mid + b[2] - s[2]
+        fwd = current_formation.fwd + b[3] - s[3]
 
         # Check if new formation is legal
-        if not new_formation.is_legal():
-            return False, f"Invalid formation after swap: {new_formation} (must have exactly 11 players with valid position counts)"
+        if not is_legal_formation(gk, def_, mid, fwd):
+            return False, f"Invalid formation after swap: {gk}-{def_}-{mid}-{fwd} (must have exactly 11 players with valid position counts)"
             
         return True, "Swap is valid"
 
@@ -306,75 +388,120 @@ class LineupOptimizer:
             List of (starter, bench, reason) tuples representing optimal swaps
         """
         swaps = []
-        current_formation = self.get_current_formation(roster)
+        # Fetch the roster rows once; the accessors may not be cheap
+        starters = roster.get_starters()
+        bench_rows = roster.get_bench_players()
+        current_formation = self.get_current_formation(roster, starters)
         current_time = datetime.now(timezone.utc)
         
-        # Collect all players and their statuses
-        starter_players = []  # [(player_row, status)]
-        bench_players = []    # [(player_row, status)]
+        # Collect all players and their statuses, evaluating the status
+        # checks once per player here rather than inside the loops below.
+        # Locked players (game in progress) can't move, so drop them up front.
+        starter_players = []  # [(player_row, status, pos, game_soon, not_starting)]
+        bench_players = []    # [(player_row, status, pos, game_soon)]
         
         # Get all starters and their statuses
-        for starter in roster.get_starters():
+        for starter in starters:
             if not starter.player:
                 continue
             status = self.get_player_status(starter.player.id)
-            starter_players.append((starter, status))
+            if status and status.is_locked:
+                continue
+            starter_players.append((
+                starter,
+                status,
+                starter.pos.short_name,
+                bool(status and status.is_game_soon(current_time)),
+                bool(status and status.is_confirmed_not_starting())
+            ))
                 
         # Get all bench players and their statuses
-        for bench in roster.get_bench_players():
+        for bench in bench_rows:
             if not bench.player:
                 continue
             status = self.get_player_status(bench.player.id)
-            bench_players.append((bench, status))
+            if status and status.is_locked:
+                continue
+            bench_players.append((
+                bench,
+                status,
+                bench.pos.short_name,
+                bool(status and status.is_game_soon(current_time))
+            ))
+        
+        # Index Priority 1 candidates by position: bench players with a known
+        # game time that isn't soon, in max-heaps keyed on game time so the
+        # latest game is always on top
+        bench_by_pos = {"G": [], "D": [], "M": [], "F": []}
+        for order, (bench, bench_status, bench_pos, game_soon) in enumerate(bench_players):
+            if bench_status and bench_status.game_time and not game_soon:
+                bucket = bench_by_pos.get(bench_pos)
+                if bucket is not None:
+                    bucket.append((-bench_status.game_time.timestamp(), order, bench, bench_status))
+        for bucket in bench_by_pos.values():
+            heapq.heapify(bucket)
+        used = set()  # player ids of bench players already chosen for a swap
+        used_starters = set()  # player ids of starters already being swapped out
         
         # Priority 1: Replace confirmed non-starters in upcoming games with players from later games
-        for starter, starter_status in starter_players:
+        for starter, starter_status, starter_pos, game_soon, not_starting in starter_players:
             # Only look at players whose games are coming up soon (within 2 hours)
-            if starter_status and starter_status.is_game_soon(current_time):
-                # If we know they're not starting
-                if starter_status.is_confirmed_not_starting():
-                    best_bench = None
-                    best_reason = None
-                    latest_game_time = None
-                    
-                    for bench, bench_status in bench_players:
-                        # Look for players with later game times where lineups aren't out yet
-                        if bench_status and bench_status.game_time:
-                            # Skip if bench player's game is also soon
-                            if bench_status.is_game_soon(current_time):
-                                continue
-                                
-                            can_swap, reason = self.can_swap_players(starter, bench, current_formation)
-                            if can_swap:
-                                # Prefer players from the latest possible game
-                                if (not latest_game_time or 
-                                    (bench_status.game_time > latest_game_time)):
-                                    
-                                    if starter.pos.short_name == bench.pos.short_name:
-                                        best_bench = bench
-                                        best_reason = f"Direct position match - replacing confirmed non-starter ({starter_status.opponent}) with player from later game ({bench_status.opponent})"
-                                        latest_game_time = bench_status.game_time
-                                    elif not best_bench:
-                                        best_bench = bench
-                                        best_reason = f"Position flexible swap - replacing confirmed non-starter ({starter_status.opponent}) with player from later game ({bench_status.opponent})"
-                                        latest_game_time = bench_status.game_time
-                    
-                    if best_bench:
-                        swaps.append((starter, best_bench, best_reason))
-                        bench_players.remove((best_bench, self.get_player_status(best_bench.player.id)))
+            # and who we know are not starting
+            if not (game_soon and not_starting):
+                continue
+            
+            best_bench = None
+            best_reason = None
+            
+            # Direct position match: a like-for-like swap leaves the formation
+            # unchanged, so the top of the bucket (latest game) is the answer
+            bucket = bench_by_pos.get(starter_pos, [])
+            while bucket and bucket[0][2].player.id in used:
+                heapq.heappop(bucket)
+            if bucket:
+                _, _, bench, bench_status = heapq.heappop(bucket)
+                best_bench = bench
+                best_reason = f"Direct position match - replacing confirmed non-starter ({starter_status.opponent}) with player from later game ({bench_status.opponent})"
+            else:
+                # Fall back to the latest game across the other positions. All
+                # players in a bucket affect the formation the same way, so
+                # only the top of each bucket needs checking
+                latest_game_time = None
+                for pos, other in bench_by_pos.items():
+                    if pos == starter_pos:
+                        continue
+                    while other and other[0][2].player.id in used:
+                        heapq.heappop(other)
+                    if not other:
+                        continue
+                    _, _, bench, bench_status = other[0]
+                    if latest_game_time and bench_status.game_time <= latest_game_time:
+                        continue
+                    can_swap, reason = self.can_swap_players(starter, bench, current_formation)
+                    if can_swap:
+                        best_bench = bench
+                        best_reason = f"Position flexible swap - replacing confirmed non-starter ({starter_status.opponent}) with player from later game ({bench_status.opponent})"
+                        latest_game_time = bench_status.game_time
+            
+            if best_bench:
+                used.add(best_bench.player.id)
+                used_starters.add(starter.player.id)
+                swaps.append((starter, best_bench, best_reason))
         
         # Priority 2: Replace non-starters with confirmed starters
-        for starter, starter_status in starter_players:
-            if starter_status and starter_status.is_confirmed_not_starting():
+        for starter, starter_status, starter_pos, _, not_starting in starter_players:
+            if not_starting and starter.player.id not in used_starters:
                 # Find best bench replacement that's confirmed starting
                 best_bench = None
                 best_reason = None
                 
-                for bench, bench_status in bench_players:
+                for bench, bench_status, bench_pos, _ in bench_players:
+                    if bench.player.id in used:
+                        continue
                     if bench_status and bench_status.is_starting:
                         can_swap, reason = self.can_swap_players(starter, bench, current_formation)
                         if can_swap:
-                            if starter.pos.short_name == bench.pos.short_name:
+                            if starter_pos == bench_pos:
                                 best_bench = bench
                                 best_reason = f"Direct position match - replacing non-starter with confirmed starter"
                                 break
@@ -383,18 +510,67 @@ class LineupOptimizer:
                                 best_reason = f"Position flexible swap - replacing non-starter with confirmed starter"
                 
                 if best_bench:
+                    used.add(best_bench.player.id)
+                    used_starters.add(starter.player.id)
                     swaps.append((starter, best_bench, best_reason))
-                    bench_players.remove((best_bench, self.get_player_status(best_bench.player.id)))
                 
         return swaps
 
+    def execute_swap(self, starter, bench) -> bool:
+        """Swap a starter with a bench player and log the outcome"""
+        success = self.api.swap_players(self.team_id, starter.player.id, bench.player.id)
+        if success:
+            logging.info("✅ Successfully swapped %s with %s", starter.player.name, bench.player.name)
+        else:
+            logging.error(f"❌ Failed to swap {starter.player.name} with {bench.player.name}")
+        return success
+
+    def execute_swaps_parallel(self, swaps: List[Tuple[any, any]]) -> List[Tuple[any, any]]:
+        """Execute swaps concurrently over the pooled session
+        
+        Only swaps that share no player with an earlier swap are sent
+        concurrently; the rest are left for the serial pass.
+        
+        Returns:
+            List of (starter, bench) swaps that overlapped another swap or
+            were rejected (409 Conflict or a failed swap), which should be
+            retried one at a time
+        """
+        independent = []
+        retry = []
+        seen = set()  # player ids touched by the swaps in `independent`
+        for starter, bench in swaps:
+            ids = {starter.player.id, bench.player.id}
+            if ids & seen:
+                retry.append((starter, bench))
+            else:
+                seen |= ids
+                independent.append((starter, bench))
+        
+        with ThreadPoolExecutor(max_workers=min(4, len(independent))) as executor:
+            futures = {
+                executor.submit(self.execute_swap, starter, bench): (starter, bench)
+                for starter, bench in independent
+            }
+            for future in as_completed(futures):
+                try:
+                    if not future.result():
+                        retry.append(futures[future])
+                except Exception as e:
+                    response = getattr(e, "response", None)
+                    if getattr(response, "status_code", None) == 409:
+                        retry.append(futures[future])
+                    else:
+                        logging.error(f"Error making swap: {e}")
+        return retry
+
     def optimize_lineup(self):
         """Main optimization logic"""
         try:
             # Get current roster
             roster = self.api.roster_info(self.team_id)
             current_formation = self.get_current_formation(roster)
-            logging.info(f"Current formation: {current_formation}")
+            logging.info("Current formation: %s", current_formation)
 
             # Validate current formation has exactly 11 players
             if not current_formation.is_legal():
@@ -433,20 +609,23 @@ class LineupOptimizer:
                 starter_status_str = get_status_str(starter_status)
                 bench_status_str = get_status_str(bench_status)
                 
-                logging.info(f"- {starter.player.name} ({starter.pos.short_name}) -> bench "
-                           f"[vs {starter_status.opponent if starter_status else 'Unknown'}, {starter_status_str}]")
-                logging.info(f"  {bench.player.name} ({bench.pos.short_name}) -> starting "
-                           f"[vs {bench_status.opponent if bench_status else 'Unknown'}, {bench_status_str}]")
-                logging.info(f"  Reason: {reason}\n")
+                logging.info("- %s (%s) -> bench [vs %s, %s]",
+                             starter.player.name, starter.pos.short_name,
+                             starter_status.opponent if starter_status else "Unknown", starter_status_str)
+                logging.info("  %s (%s) -> starting [vs %s, %s]",
+                             bench.player.name, bench.pos.short_name,
+                             bench_status.opponent if bench_status else "Unknown", bench_status_str)
+                logging.info("  Reason: %s\n", reason)
 
             # Execute swaps
-            for starter, bench, _ in optimal_swaps:
+            pending = [(starter, bench) for starter, bench, _ in optimal_swaps]
+            if self.parallel_swaps and len(pending) > 1:
+                pending = self.execute_swaps_parallel(pending)
+                if pending:
+                    logging.warning("%d swaps overlapped or were rejected, retrying them serially", len(pending))
+            for starter, bench in pending:
                 try:
-                    success = self.api.swap_players(self.team_id, starter.player.id, bench.player.id)
-                    if success:
-                        logging.info(f"✅ Successfully swapped {starter.player.name} with {bench.player.name}")
-                    else:
-                        logging.error(f"❌ Failed to swap {starter.player.name} with {bench.player.name}")
+                    self.execute_swap(starter, bench)
                 except Exception as e:
                     logging.error(f"Error making swap: {e}")
 
@@ -468,28 +647,30 @@ def load_config():
     return {
         "league_id": config["fantrax"]["league_id"],
         "team_id": config["fantrax"]["team_id"],
-        "cookie_path": config["fantrax"]["cookie_path"]
+        "cookie_path": config["fantrax"]["cookie_path"],
+        "parallel_swaps": config["fantrax"].getboolean("parallel_swaps", fallback=False)
     }
 
 def main():
     # Load configuration
     config = load_config()
     
-    # Initialize optimizer
+    # Initialize optimizer once so its pooled session survives between cycles
     optimizer = LineupOptimizer(
         league_id=config["league_id"],
         team_id=config["team_id"],
-        cookie_path=config["cookie_path"]
+        cookie_path=config["cookie_path"],
+        parallel_swaps=config["parallel_swaps"]
     )
     
-    # Run continuous optimization loop
-    check_interval = 300  # 5 minutes
+    # Run continuous optimization loop, paced by upcoming kickoff times
     while True:
         try:
             logging.info("Running lineup optimization...")
             optimizer.optimize_lineup()
             
-            logging.info(f"Sleeping for {check_interval} seconds...")
+            check_interval = optimizer.next_check_interval()
+            logging.info("Sleeping for %.0f seconds...", check_interval)
             time.sleep(check_interval)
             
         except KeyboardInterrupt:
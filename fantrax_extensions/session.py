@@ -0,0 +1,64 @@
+"""
+Helpers for building the authenticated requests session used to talk to
+Fantrax. Both the lineup optimizer and substitutions.py go through here so
+they share the same connection pooling, retry and cookie setup.
+"""
+
+from contextlib import contextmanager
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fantrax_extensions.cookies import load_session_cookies
+
+# Transient responses worth retrying with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def make_adapter(pool_connections: int = 4, pool_maxsize: int = 16, retries: int = 5,
+                 backoff_factor: float = 0.5, retry_post: bool = False) -> HTTPAdapter:
+    """Build a pooled keep-alive adapter that retries transient failures
+
+    urllib3 never resends a POST by default. Every fxpa/req read is a POST,
+    so ``retry_post`` opts in to that, but it must stay off for any session
+    that is also used for writes such as lineup swaps.
+    """
+    allowed_methods = Retry.DEFAULT_ALLOWED_METHODS
+    if retry_post:
+        allowed_methods = allowed_methods | {"POST"}
+    return HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=allowed_methods
+        )
+    )
+
+def create_session(cookie_path: str, session: Session = None, **adapter_options) -> Session:
+    """Mount a pooled, retrying adapter and load the login cookies
+
+    Pass ``session`` to set up an existing session (e.g. a CachedSession)
+    instead of a new one; ``adapter_options`` are passed to make_adapter().
+    """
+    if session is None:
+        session = Session()
+    session.mount("https://", make_adapter(**adapter_options))
+    load_session_cookies(session, cookie_path)
+    return session
+
+@contextmanager
+def post_retries_disabled(session: Session):
+    """Stop the session's https adapter from resending POSTs for the duration
+
+    For a write (like a swap) made on a session whose reads retry POSTs: a
+    502/504 often means the change was already applied, so it mustn't be sent
+    again. Connection errors, raised before anything is sent, still retry.
+    """
+    adapter = session.get_adapter("https://")
+    max_retries = adapter.max_retries
+    adapter.max_retries = max_retries.new(allowed_methods=Retry.DEFAULT_ALLOWED_METHODS)
+    try:
+        yield
+    finally:
+        adapter.max_retries = max_retries
@@ -6,6 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "fantraxapi",  # The base package
+        "orjson",
     ],
     author="hogan_m",
     description="Extensions and tools for the FantraxAPI package",
@@ -17,5 +18,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.10",
 )
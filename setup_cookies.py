@@ -9,7 +9,6 @@ This script will:
 """
 
 import time
-import pickle
 import os
 from pathlib import Path
 from configparser import ConfigParser
@@ -17,6 +16,7 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+from fantrax_extensions.cookies import save_cookies
 
 def load_config():
     """Load configuration from config.ini"""
@@ -75,8 +75,7 @@ def main():
 
         # Save cookies
         cookies = driver.get_cookies()
-        with open(cookie_path, "wb") as f:
-            pickle.dump(cookies, f)
+        save_cookies(cookies, cookie_path)
         
         print(f"\n✅ Successfully saved cookies to: {cookie_path}")
         print("\nYou can now use the substitutions.py script to manage your roster!")
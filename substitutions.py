@@ -5,30 +5,69 @@ This demonstrates the actual substitution functionality.
 """
 
 import os
+import re
 import sys
-import pickle
+import time
+import heapq
 import argparse
 from pathlib import Path
-from configparser import ConfigParser
-from fantraxapi import FantraxAPI
-from requests import Session
-from dotenv import load_dotenv
+from collections import Counter
+
+# Roster rows in this slot are on the bench
+BENCH_POS_ID = "0"
+
+# Accepted answers to the confirmation prompt
+_YES = frozenset({"y", "yes"})
+
+# team_id -> (time.monotonic() when fetched, roster)
+_roster_cache = {}
+
+_SECTION_RE = re.compile(r"^\s*\[([^\]]+)\]\s*$")
+_OPTION_RE = re.compile(r"^\s*([^=:\s]+)\s*[=:]\s*(.*?)\s*$")
+
+def read_config_section(path: Path, section: str):
+    """Return the options of one [section] of an INI file, or None if it's missing.
+
+    Only what config.ini needs: one "key = value" (or "key: value") per
+    line and "#"/";" comments, with no interpolation or multi-line values.
+    Keys are lower-cased like ConfigParser does.
+    """
+    options = None
+    current = None
+    with open(path) as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith(("#", ";")):
+                continue
+            match = _SECTION_RE.match(line)
+            if match:
+                current = match.group(1).strip()
+                if current == section and options is None:
+                    options = {}
+                continue
+            if current == section:
+                match = _OPTION_RE.match(line)
+                if match:
+                    options[match.group(1).lower()] = match.group(2)
+    return options
 
 def load_config():
     """Load configuration from .env or config.ini"""
-    # Try loading from .env first
-    load_dotenv()
+    # Try loading .env from the working directory first, if there is one
+    env_path = Path(".env")
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(env_path, override=False)
     
     # Then try config.ini, which will override .env values if present
-    config = ConfigParser()
     config_path = Path("config.ini")
     if config_path.exists():
-        config.read(config_path)
-        if "fantrax" in config:
+        fantrax = read_config_section(config_path, "fantrax")
+        if fantrax is not None:
             return {
-                "league_id": config["fantrax"].get("league_id") or os.getenv("LEAGUE_ID"),
-                "team_id": config["fantrax"].get("team_id") or os.getenv("TEAM_ID"),
-                "cookie_path": config["fantrax"].get("cookie_path") or os.getenv("COOKIE_PATH", "deploy/fantraxloggedin.cookie")
+                "league_id": fantrax.get("league_id") or os.getenv("LEAGUE_ID"),
+                "team_id": fantrax.get("team_id") or os.getenv("TEAM_ID"),
+                "cookie_path": fantrax.get("cookie_path") or os.getenv("COOKIE_PATH", "deploy/fantraxloggedin.cookie")
             }
     
     # Return environment variables if no config.ini
@@ -38,29 +77,88 @@ def load_config():
         "cookie_path": os.getenv("COOKIE_PATH", "deploy/fantraxloggedin.cookie")
     }
 
-def make_substitution_example(league_id: str, team_id: str = None):
-    """Example of how to make a substitution."""
+def create_api(league_id: str, cookie_path: str):
+    """Create a FantraxAPI on one authenticated, pooled, caching session.
+
+    The session is shared by every menu action so all calls reuse the same
+    keep-alive connection, and responses are cached on disk for a minute so
+    running the script again shortly after doesn't re-fetch the roster.
+    Returns (session, api), or (None, None) if the cookies can't be loaded.
+    """
+    # Imported here so --help and argument errors don't pay for them
+    from fantraxapi import FantraxAPI
+    from requests_cache import CachedSession
+    from fantrax_extensions.session import create_session
+
+    # Fantrax reads go through POST, so POST responses are cached too
+    session = CachedSession(
+        cache_name=".fantrax_cache",
+        backend="sqlite",
+        expire_after=60,
+        allowable_methods=("GET", "POST")
+    )
 
-    # Load authenticated session
-    session = Session()
-    config = load_config()
-    cookie_path = config["cookie_path"]
-    
     try:
-        with open(cookie_path, "rb") as f:
-            for cookie in pickle.load(f):
-                session.cookies.set(cookie["name"], cookie["value"])
+        # Absorb transient 429/5xx in-process; Fantrax endpoints are POSTs,
+        # which urllib3 doesn't retry by default
+        create_session(cookie_path, session, retry_post=True)
         print("✅ Cookie session loaded successfully")
     except FileNotFoundError:
         print(f"❌ Cookie file not found at {cookie_path}! Please run the bootstrap script first:")
         print("  python bootstrap_cookie.py")
-        return
+        return None, None
     except Exception as e:
         print(f"❌ Error loading cookie: {e}")
-        return
+        return None, None
+
+    return session, FantraxAPI(league_id, session=session)
+
+def get_roster(api, team_id: str, max_age: float = 30.0):
+    """Return the team's roster, reusing one fetched within the last max_age seconds"""
+    cached = _roster_cache.get(team_id)
+    if cached and time.monotonic() - cached[0] < max_age:
+        return cached[1]
 
-    # Initialize API with authenticated session
-    api = FantraxAPI(league_id, session=session)
+    roster = api.roster_info(team_id)
+    _roster_cache[team_id] = (time.monotonic(), roster)
+    return roster
+
+def is_bench(row) -> bool:
+    """True if the roster row is on the bench"""
+    return row.pos_id == BENCH_POS_ID
+
+def index_by_name(roster):
+    """Map case-folded player names to their roster rows for O(1) lookups"""
+    return {row.player.name.casefold(): row for row in roster.rows if row.player}
+
+def split_lineup(roster):
+    """Partition the roster's filled rows into (starters, bench) in one pass"""
+    starters, bench = [], []
+    for row in roster.rows:
+        if row.player:
+            (bench if is_bench(row) else starters).append(row)
+    return starters, bench
+
+def _format_row(row) -> str:
+    """Render one roster row as an indented "POS: Name (TEAM)" line"""
+    player, pos = row.player, row.pos
+    return f"  {pos.short_name}: {player.name} ({player.team_short_name})"
+
+def _format_lineup(roster, title: str) -> str:
+    """Render a roster's starters and bench as one printable block"""
+    starters, bench = split_lineup(roster)
+    lines = [f"\n=== {title} ===", "Starters:"]
+    lines.extend(map(_format_row, starters))
+    lines.append("\nBench:")
+    lines.extend(map(_format_row, bench))
+    return "\n".join(lines)
+
+def make_substitution_example(api, session, team_id: str = None, refresh: bool = False):
+    """Example of how to make a substitution.
+
+    After a successful swap the cached roster is updated in place rather
+    than fetched again, unless refresh is set.
+    """
 
     # Get the specified team or default to first team
     if team_id:
@@ -76,48 +174,51 @@ def make_substitution_example(league_id: str, team_id: str = None):
     print(f"Working with team: {my_team.name}")
 
     # Get current roster
-    roster = api.roster_info(my_team.team_id)
+    roster = get_roster(api, my_team.team_id)
 
     # Show current lineup
-    print("\n=== CURRENT LINEUP ===")
-    print("Starters:")
-    for row in roster.get_starters():
-        print(f"  {row.pos.short_name}: {row.player.name} ({row.player.team_short_name})")
-
-    print("\nBench:")
-    for row in roster.get_bench_players():
-        print(f"  {row.pos.short_name}: {row.player.name} ({row.player.team_short_name})")
+    sys.stdout.write(_format_lineup(roster, "CURRENT LINEUP") + "\n")
 
     # Example: Find players to swap
     print("\n=== MAKING SUBSTITUTION ===")
 
-    # Find a starter to move to bench
+    # Collect both names before going back to the roster, so cancelling costs
+    # nothing and a long pause at the prompts doesn't leave us working from a
+    # stale roster
     starter_name = input("Enter name of starter to move to bench: ").strip()
     if not starter_name:
         print("No starter name provided, skipping substitution.")
         return
 
-    starter_row = roster.get_player_by_name(starter_name)
+    bench_name = input("Enter name of bench player to move to starters: ").strip()
+    if not bench_name:
+        print("No bench player name provided, skipping substitution.")
+        return
+
+    # Same roster as above unless the prompts outlasted the in-memory cache,
+    # in which case this re-fetches it from Fantrax (not the HTTP cache)
+    # before the swap
+    with session.cache_disabled():
+        roster = get_roster(api, my_team.team_id)
+    by_name = index_by_name(roster)
+
+    # Find a starter to move to bench
+    starter_row = by_name.get(starter_name.casefold())
     if not starter_row:
         print(f"Starter '{starter_name}' not found!")
         return
 
-    if starter_row.pos_id == "0":
+    if is_bench(starter_row):
         print(f"'{starter_name}' is already on the bench!")
         return
 
     # Find a bench player to move to starters
-    bench_name = input("Enter name of bench player to move to starters: ").strip()
-    if not bench_name:
-        print("No bench player name provided, skipping substitution.")
-        return
-
-    bench_row = roster.get_player_by_name(bench_name)
+    bench_row = by_name.get(bench_name.casefold())
     if not bench_row:
         print(f"Bench player '{bench_name}' not found!")
         return
 
-    if bench_row.pos_id != "0":
+    if not is_bench(bench_row):
         print(f"'{bench_name}' is already a starter!")
         return
 
@@ -126,56 +227,50 @@ def make_substitution_example(league_id: str, team_id: str = None):
     print(f"  OUT: {starter_row.player.name} ({starter_row.pos.short_name}) → Bench")
     print(f"  IN:  {bench_row.player.name} ({starter_row.pos.short_name}) → Starters")
 
-    confirm = input("\nProceed with this substitution? (yes/no): ").strip().lower()
-    if confirm not in ['yes', 'y']:
+    confirm = input("\nProceed with this substitution? (yes/no): ").strip().casefold()
+    if confirm not in _YES:
         print("Substitution cancelled.")
         return
 
     # Make the substitution
+    from fantrax_extensions.session import post_retries_disabled
     try:
         print("\nExecuting substitution...")
-        success = api.swap_players(my_team.team_id, starter_row.player.id, bench_row.player.id)
+        try:
+            # Never answer a lineup change from the cache, and never resend it
+            with session.cache_disabled(), post_retries_disabled(session):
+                success = api.swap_players(my_team.team_id, starter_row.player.id, bench_row.player.id)
+        finally:
+            # Cached roster responses are stale once a swap has been attempted,
+            # even one that raised, since the server may still have applied it
+            session.cache.clear()
+            cached = _roster_cache.pop(my_team.team_id, None)
 
         if success:
             print("✅ Substitution successful!")
 
-            # Refresh roster to show changes
-            print("\nRefreshing roster...")
-            new_roster = api.roster_info(my_team.team_id)
-
-            print("\n=== UPDATED LINEUP ===")
-            print("Starters:")
-            for row in new_roster.get_starters():
-                print(f"  {row.pos.short_name}: {row.player.name} ({row.player.team_short_name})")
-
-            print("\nBench:")
-            for row in new_roster.get_bench_players():
-                print(f"  {row.pos.short_name}: {row.player.name} ({row.player.team_short_name})")
+            if refresh:
+                # Refresh roster to show changes
+                print("\nRefreshing roster...")
+                new_roster = get_roster(api, my_team.team_id)
+            else:
+                # We know exactly what changed, so apply it to the rows we hold
+                starter_row.pos_id, bench_row.pos_id = bench_row.pos_id, starter_row.pos_id
+                new_roster = roster
+                # ...which makes the cached roster (the same rows) current again
+                if cached:
+                    _roster_cache[my_team.team_id] = cached
+
+            sys.stdout.write(_format_lineup(new_roster, "UPDATED LINEUP") + "\n")
         else:
             print("❌ Substitution failed!")
 
     except Exception as e:
         print(f"❌ Error making substitution: {e}")
 
-def show_roster_analysis(league_id: str, team_id: str = None):
+def show_roster_analysis(api, team_id: str = None):
     """Show detailed roster analysis."""
 
-    # Load authenticated session
-    session = Session()
-    try:
-        with open("deploy/fantraxloggedin.cookie", "rb") as f:
-            for cookie in pickle.load(f):
-                session.cookies.set(cookie["name"], cookie["value"])
-    except FileNotFoundError:
-        print("❌ Cookie file not found! Please run the bootstrap script first:")
-        print("  cd utils && python bootstrap_cookie.py")
-        return
-    except Exception as e:
-        print(f"❌ Error loading cookie: {e}")
-        return
-
-    api = FantraxAPI(league_id, session=session)
-
     # Get the specified team or default to first team
     if team_id:
         try:
@@ -187,35 +282,29 @@ def show_roster_analysis(league_id: str, team_id: str = None):
         my_team = api.teams[0]
         print(f"⚠️  No team_id provided, using first team: {my_team.name}")
 
-    roster = api.roster_info(my_team.team_id)
+    roster = get_roster(api, my_team.team_id)
 
     print(f"\n=== ROSTER ANALYSIS FOR {my_team.name} ===")
 
-    # Position breakdown
-    positions = {}
-    for row in roster.rows:
-        if row.player:
-            pos = row.pos.short_name
-            if pos not in positions:
-                positions[pos] = {"starters": 0, "bench": 0}
+    # Walk the roster once and reuse the partition for both sections below
+    starters, bench = split_lineup(roster)
 
-            if row.pos_id == "0":
-                positions[pos]["bench"] += 1
-            else:
-                positions[pos]["starters"] += 1
-
-    for pos, counts in positions.items():
-        print(f"{pos}: {counts['starters']} starters, {counts['bench']} bench")
+    # Position breakdown, counted keyed by (position, on bench)
+    counts = Counter((row.pos.short_name, False) for row in starters)
+    counts.update((row.pos.short_name, True) for row in bench)
+    for pos in dict.fromkeys(pos for pos, _ in counts):
+        print(f"{pos}: {counts[(pos, False)]} starters, {counts[(pos, True)]} bench")
 
     # Top performers (by FPPG)
-    starters = roster.get_starters()
-    starters_with_fppg = [row for row in starters if row.fppg is not None]
-    starters_with_fppg.sort(key=lambda x: x.fppg, reverse=True)
+    top_starters = heapq.nlargest(5, (row for row in starters if row.fppg is not None), key=lambda row: row.fppg)
 
-    if starters_with_fppg:
-        print(f"\nTop 5 starters by FPPG:")
-        for i, row in enumerate(starters_with_fppg[:5]):
-            print(f"  {i+1}. {row.player.name}: {row.fppg:.1f} FPPG")
+    if top_starters:
+        lines = ["\nTop 5 starters by FPPG:"]
+        lines.extend(
+            f"  {i}. {row.player.name}: {row.fppg:.1f} FPPG"
+            for i, row in enumerate(top_starters, start=1)
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     # Load configuration
@@ -228,6 +317,8 @@ def main():
     parser.add_argument('--team-id', '-t',
                        default=config.get('team_id'),
                        help='Fantrax Team ID (override config file/env var)')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Re-fetch the roster after a substitution instead of updating it locally')
 
     args = parser.parse_args()
 
@@ -239,6 +330,16 @@ def main():
         print("  LEAGUE_ID=o90qdw15mc719reh python example_substitution.py")
         sys.exit(1)
 
+    # One session and API client for the whole run
+    session, api = create_api(args.league_id, config["cookie_path"])
+    if api is None:
+        sys.exit(1)
+
+    handlers = {
+        "1": lambda: make_substitution_example(api, session, args.team_id, args.refresh),
+        "2": lambda: show_roster_analysis(api, args.team_id),
+    }
+
     try:
         print("FantraxAPI Lineup Substitution Example")
         print("=" * 40)
@@ -251,10 +352,9 @@ def main():
 
             choice = input("\nSelect an option (1-3): ").strip()
 
-            if choice == "1":
-                make_substitution_example(args.league_id, args.team_id)
-            elif choice == "2":
-                show_roster_analysis(args.league_id, args.team_id)
+            handler = handlers.get(choice)
+            if handler:
+                handler()
             elif choice == "3":
                 print("Goodbye!")
                 break